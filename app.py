@@ -1,11 +1,39 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import os
-import matplotlib.pyplot as plt
+import json
 from wordcloud import WordCloud
 import platform
 import re
+from collections import Counter
+
+# 可选依赖：装了 hyperscan 就一次扫描匹配全部关键词，没装则退回 polars 或 re
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# 可选依赖：没有 hyperscan 时用 polars (Rust 正则，多线程) 逐行计数
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# 可选依赖：python-calamine (Rust) 解析 xlsx 比 openpyxl 快得多
+# pandas 2.2 起才支持 engine="calamine"，老版本照旧用 openpyxl
+try:
+    import python_calamine  # noqa: F401
+
+    PANDAS_VERSION = tuple(int(x) for x in pd.__version__.split(".")[:2])
+    EXCEL_ENGINE = "calamine" if PANDAS_VERSION >= (2, 2) else "openpyxl"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
 
 # === 1. 基础配置 ===
 st.set_page_config(page_title="招聘数据看板", layout="wide")
@@ -27,75 +55,425 @@ if not os.path.exists(FONT_PATH):
     else:
         FONT_PATH = None  # Linux/Cloud 需要自行上传字体文件
 
+# 后面真正用到的列，读 Excel 时只解析这几列
+USED_COLUMNS = ["keyword", "title", "company", "salary_min", "demand", "url"]
+
+# 自动改名兼容旧数据 (旧列名 -> 新列名)
+COLUMN_ALIASES = {
+    "salarymin": "salary_min",
+    "salaryMin": "salary_min",
+    "avg_annual_K": "salary_min",  # 强力兼容
+    "job_detail": "demand",
+    "description": "demand",  # 兼容JD列
+}
+
+# 从 parquet 读回时，字符串列保持 Arrow 存储 (后面拼语料可以零拷贝)
+ARROW_STRING_TYPES = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.large_string(): pd.StringDtype("pyarrow"),
+}
+
+# parquet 缓存是按这套列投影 / 别名写的，签名存进文件元数据；
+# 以后改了 USED_COLUMNS 或 COLUMN_ALIASES，旧缓存会自动作废
+CACHE_SIGNATURE_KEY = b"dashboard_columns"
+CACHE_SIGNATURE = json.dumps(
+    [USED_COLUMNS, COLUMN_ALIASES], ensure_ascii=False, sort_keys=True
+).encode("utf-8")
+
+
+# === 2. 技能词库 (严格分离) ===
+# === A. 纯硬核技术栈 (English / Code Only) ===
+# 剔除了中文词（如'算法'），只留代码相关的英文，保证视觉纯净
+TECH_STACK_LIST = [
+    "Java",
+    "Python",
+    "C++",
+    "C#",
+    "Go",
+    "Golang",
+    "PHP",
+    "Ruby",
+    "Rust",
+    "Swift",
+    "Kotlin",
+    "JavaScript",
+    "TypeScript",
+    "HTML",
+    "CSS",
+    "Vue",
+    "React",
+    "Angular",
+    "Node",
+    "Node.js",
+    "Spring",
+    "SpringBoot",
+    "SpringCloud",
+    "MyBatis",
+    "Hibernate",
+    "JVM",
+    "Netty",
+    "MySQL",
+    "Redis",
+    "Oracle",
+    "MongoDB",
+    "PostgreSQL",
+    "SQL",
+    "NoSQL",
+    "Linux",
+    "Shell",
+    "Bash",
+    "Docker",
+    "K8s",
+    "Kubernetes",
+    "Nginx",
+    "Git",
+    "Jenkins",
+    "CI/CD",
+    "Kafka",
+    "RabbitMQ",
+    "RocketMQ",
+    "Elasticsearch",
+    "Hadoop",
+    "Spark",
+    "Flink",
+    "Hive",
+    "TensorFlow",
+    "PyTorch",
+    "LLM",
+    "NLP",
+    "CV",
+    "Transformer",
+    "BERT",
+    "GPT",
+]
+
+# === B. 综合素质与软技能 (Chinese Only) ===
+# 只留中文描述，分析性格与能力
+SOFT_SKILLS_LIST = [
+    "沟通",
+    "团队",
+    "协作",
+    "责任心",
+    "抗压",
+    "学习能力",
+    "逻辑思维",
+    "自驱力",
+    "热情",
+    "细心",
+    "解决问题",
+    "执行力",
+    "英语",
+    "文档能力",
+    "积极",
+    "主动",
+    "乐观",
+    "创新",
+    "严谨",
+    "诚信",
+    "刻苦",
+    "适应能力",
+    "数据结构",
+    "算法",
+    "多线程",
+    "消息循环",
+    "计算机网络",
+    "操作系统",
+    "数据库",
+    "计算机组成",
+    "本科",
+    "硕士",
+    "博士",
+    "计算机",
+    "软件工程",
+]
+
+# 两个维度的词一起统计，切换维度时不用重新扫描文本
+ALL_KEYWORDS = tuple(TECH_STACK_LIST + SOFT_SKILLS_LIST)
+
+
+def display_name(word):
+    # 统一 Key 的显示格式 (比如把 JAVA 统一显示为 Java)
+    if word.upper() in ["HTML", "CSS", "SQL"]:
+        return word.upper()
+    if word.capitalize() in ["Java", "Python"]:
+        return word.capitalize()
+    return word
+
+
+# 词库是常量，显示名启动时算一次，渲染时直接查表
+KEYWORD_DISPLAY = {word: display_name(word) for word in ALL_KEYWORDS}
+
+
+@st.cache_resource
+def compile_keyword_db(keywords):
+    # 把整张词表编译成一个 Hyperscan 数据库 (同一词表只编译一次)
+    # 字面量模式，C++ / C# 之类不用转义
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[word.encode("utf-8") for word in keywords],
+        ids=list(range(len(keywords))),
+        elements=len(keywords),
+        flags=hyperscan.HS_FLAG_CASELESS,
+        literal=True,
+    )
+    return db
+
+
+@st.cache_resource
+def compile_keyword_regex(keywords):
+    # hyperscan / polars 都没装时的退路：全部关键词拼成一个正则，一次扫完
+    # 放进零宽先行断言里，每个位置都尝试一次，相邻/交叠的词 (如 PythonLP 里的 NLP)
+    # 不会被前一个匹配吞掉；长词排前面，同一位置取最长的词
+    # 每个词单独一个捕获组，命中后用 m.lastindex 就知道是哪个词，
+    # 不依赖匹配到的原文 (忽略大小写时原文不一定能映射回词表，比如 LİNUX)
+    ordered = sorted(range(len(keywords)), key=lambda i: len(keywords[i]), reverse=True)
+    alternation = "|".join(f"({re.escape(keywords[i])})" for i in ordered)
+    pattern = re.compile(f"(?=(?:{alternation}))", re.IGNORECASE)
+
+    # 同一位置开头的短词一定是最长词的前缀 (JavaScript 里的 Java)，
+    # 按捕获组预先记下对应的词及其关键词前缀，命中时一并计数
+    # (词表里没有能和自身交叠的词，所以结果与逐词 re.findall 一致)
+    prefixes = {}
+    for group, i in enumerate(ordered, start=1):
+        prefixes[group] = [
+            j
+            for j, other in enumerate(keywords)
+            if re.match(re.escape(other), keywords[i], re.IGNORECASE)
+        ]
+    return pattern, prefixes
+
+
+def build_corpus(demand):
+    # 把选中岗位的 JD 拼成一整段文本；只由 count_keywords 调用，结果随它一起缓存
+    # 整列当成一个 list 交给 Arrow 在 C 层拼接，不用先生成 Python 字符串列表
+    # 显式指定类型：object 列为空时 Arrow 会推断成 null 类型，后面拼接会报错
+    values = pa.array(demand.dropna().astype(str), type=pa.large_string())
+    if isinstance(values, pa.ChunkedArray):  # 多个岗位 concat 后可能是分块的
+        values = values.combine_chunks()
+    rows = pa.ListArray.from_arrays([0, len(values)], values)
+    return pc.binary_join(rows, pa.scalar(" ", values.type))[0].as_py()
+
+
+@st.cache_data(show_spinner=False)
+def count_keywords(demand, keyword_list):
+    # 结果按 (JD 列, 词表) 缓存，只要选中的岗位不变就直接命中
+    hits = [0] * len(keyword_list)
+    if hyperscan is not None:
+        # 单次扫描全文，每命中一次给对应关键词 +1
+        def on_match(idx, start, end, flags, context):
+            hits[idx] += 1
+
+        # 数据库跨会话共享，scratch 每次单独分配，多人同时扫描才不会冲突
+        db = compile_keyword_db(keyword_list)
+        db.scan(
+            build_corpus(demand).encode("utf-8"),
+            match_event_handler=on_match,
+            scratch=hyperscan.Scratch(db),
+        )
+    elif pl is not None:
+        # 各关键词的表达式由 polars 并行执行，每行计数后求和，不必拼整段文本
+        rows = pl.DataFrame({"demand": pl.from_pandas(demand.dropna().astype(str))})
+        exprs = [
+            pl.col("demand")
+            .str.count_matches("(?i)" + re.escape(word))
+            .sum()
+            .alias(str(i))
+            for i, word in enumerate(keyword_list)
+        ]
+        hits = list(rows.select(exprs).row(0))
+    else:
+        pattern, prefixes = compile_keyword_regex(keyword_list)
+        text = build_corpus(demand)
+        found = Counter(m.lastindex for m in pattern.finditer(text))
+        for group, n in found.items():
+            for i in prefixes[group]:
+                hits[i] += n
+
+    return {word: matches for word, matches in zip(keyword_list, hits) if matches}
+
+
+def pick_counts(all_counts, keyword_list):
+    # 从全量统计结果里挑出当前维度的词
+    counts = {}
+    for word in keyword_list:
+        matches = all_counts.get(word, 0)
+        if matches > 0:
+            counts[KEYWORD_DISPLAY[word]] = matches
+    return counts
+
+
+@st.cache_data(show_spinner=False)
+def render_wordcloud(frequencies, color_map, font_path):
+    # 词频不变就直接复用上次画好的图 (返回 RGB 数组，交给 st.image 显示)
+    wc = WordCloud(
+        font_path=font_path,  # 确保有中文字体
+        width=1000,
+        height=500,  # 画布变大
+        background_color="white",
+        colormap=color_map,
+        max_words=100,
+        prefer_horizontal=0.9,
+    ).generate_from_frequencies(dict(frequencies))
+    return wc.to_array()
+
+
+@st.cache_data(show_spinner=False)
+def make_box_figure(salary_df):
+    # 只传 keyword / salary_k 两列进来，缓存 key 算得快；岗位没变就复用图
+    # 直接按岗位分组造 go.Box，省掉 px 内部的通用分组逻辑
+    groups = salary_df.groupby("keyword", sort=False, observed=True)["salary_k"]
+    # float32 数组会被 plotly 以 base64 二进制传给前端，比逐个数字写 JSON 省得多
+    traces = [
+        go.Box(y=group.to_numpy(dtype=np.float32), name=keyword)
+        for keyword, group in groups
+    ]
+    fig = go.Figure(traces)
+    fig.update_layout(
+        title="各岗位薪资分布区间",
+        xaxis_title="岗位",
+        yaxis_title="月薪(K)",
+        legend_title_text="岗位",
+    )
+    return fig
 
-def clean_monthly_salary(row):
-    # 优先取 salary_min，如果没有则取 salary_display 里的数字试试（防止爬虫没存min）
-    val = row.get("salary_min", 0)
 
-    # 如果没取到值，或者是空
-    if pd.isna(val):
-        return 0
+@st.cache_data(show_spinner=False)
+def make_bar_figure(avg_df):
+    return px.bar(
+        avg_df.assign(salary_k=avg_df["salary_k"].astype(np.float32)),
+        x="keyword",
+        y="salary_k",
+        color="keyword",
+        text_auto=".1f",
+        title="各岗位平均薪资对比",
+        labels={"salary_k": "平均月薪(K)", "keyword": "岗位"},
+    )
 
-    # 过滤掉 0 值
-    if val <= 0:
-        return 0
 
-    # 【单位归一化】
-    # 虽然都是月薪，但有的写 20000(元)，有的写 20(k)
-    # 为了画图不错乱，统一转成 k
-    if val > 1000:
-        return val / 1000  # 比如 20000 -> 20k
-    else:
-        return val  # 比如 20 -> 20k
+# === 3. 数据加载 ===
+def canonical_columns(names):
+    return [COLUMN_ALIASES.get(name, name) for name in names]
 
 
-# === 3. 数据加载 ===
-@st.cache_data
-def load_data(file):
+def read_excel(file):
+    # 只解析用得到的列 (按改名后的列名判断，旧数据也能选中)
+    return pd.read_excel(
+        file,
+        engine=EXCEL_ENGINE,
+        usecols=lambda col: COLUMN_ALIASES.get(col, col) in USED_COLUMNS,
+    )
+
+
+def read_cache(cache_path):
+    # 缓存文件损坏，或是按旧的列投影写的，都当作没有缓存，回头重新解析 xlsx
     try:
-        df = pd.read_excel(file)
-
-        # 自动改名兼容旧数据
-        rename_dict = {
-            "salarymin": "salary_min",
-            "salaryMin": "salary_min",
-            "avg_annual_K": "salary_min",  # 强力兼容
-            "demand": "demand",
-            "job_detail": "demand",
-            "description": "demand",  # 兼容JD列
-        }
-        df.rename(columns=rename_dict, inplace=True)
-
-        # 执行清洗
-        if "salary_min" in df.columns:
-            df["salary_k"] = df.apply(clean_monthly_salary, axis=1)
-            # 只保留大于0的数据 (即剔除了0)
-            valid_df = df[df["salary_k"] > 0].copy()
-            return valid_df
-        else:
-            return pd.DataFrame()  # 没找到列
+        table = pq.read_table(cache_path)
+    except (OSError, pa.ArrowException):
+        return None
+    metadata = table.schema.metadata or {}
+    if metadata.get(CACHE_SIGNATURE_KEY) != CACHE_SIGNATURE:
+        return None
+    return table
+
+
+def read_source(file):
+    # 上传的文件只在内存里，每次都直接解析
+    if not isinstance(file, str):
+        df = read_excel(file)
+        df.columns = canonical_columns(df.columns)
+        return df
+
+    # 本地 xlsx 第一次解析后另存一份 parquet，之后只要 xlsx 没改过就直接读 parquet
+    cache_path = os.path.splitext(file)[0] + ".parquet"
+    if os.path.exists(cache_path):
+        if os.path.getmtime(file) <= os.path.getmtime(cache_path):
+            table = read_cache(cache_path)
+            if table is not None:
+                # 列名直接在 Arrow 表结构上改，字符串列转过来仍用 Arrow 存储
+                table = table.rename_columns(canonical_columns(table.column_names))
+                return table.to_pandas(types_mapper=ARROW_STRING_TYPES.get)
+
+    df = read_excel(file)
+    try:
+        # 先写临时文件再替换，避免写到一半留下坏的缓存
+        # 缓存里保留原始列名，改名在读回时做
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[CACHE_SIGNATURE_KEY] = CACHE_SIGNATURE
+        tmp_path = cache_path + ".tmp"
+        pq.write_table(
+            table.replace_schema_metadata(metadata), tmp_path, compression="zstd"
+        )
+        os.replace(tmp_path, cache_path)
+    except (OSError, pa.ArrowException):
+        pass  # 目录只读或列类型混杂时不缓存，不影响正常读取
+    df.columns = canonical_columns(df.columns)
+    return df
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_data(file, mtime=None):
+    # mtime 只参与缓存 key：本地 xlsx 改过之后会重新读取
+    # 读取出错时直接抛出，由调用处提示；异常不会被缓存，修好文件后刷新即可
+    df = read_source(file)
+
+    # 执行清洗
+    if "salary_min" in df.columns:
+        # 空值 / 非数字 / 0 值一律记为 0，后面会被剔除
+        val = pd.to_numeric(df["salary_min"], errors="coerce").fillna(0).to_numpy()
+        # 【单位归一化】
+        # 虽然都是月薪，但有的写 20000(元)，有的写 20(k)
+        # 为了画图不错乱，统一转成 k (20000 -> 20k, 20 -> 20k)
+        df["salary_k"] = np.where(val <= 0, 0.0, np.where(val > 1000, val / 1000, val))
+        # 只保留大于0的数据 (即剔除了0)
+        valid_df = df[df["salary_k"] > 0].copy()
+        # 岗位方向只有十几个取值，存成 category 后 isin / groupby 都按整数编码算
+        if "keyword" in valid_df.columns:
+            valid_df["keyword"] = valid_df["keyword"].astype("category")
+        return valid_df
+    else:
+        return pd.DataFrame()  # 没找到列
 
-    except Exception as e:
-        st.error(f"读取失败: {e}")
-        return pd.DataFrame()
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def partition_by_keyword(file, mtime=None):
+    # 按岗位预先拆好 (只拆一次，各次运行共享同一份，下游只读)
+    # 每份上传文件都会占一个缓存位，只保留最近几份，避免常驻内存越积越多
+    df = load_data(file, mtime)
+    if "keyword" not in df.columns:
+        return {}
+    groups = df.groupby("keyword", sort=False, observed=True)
+    return {keyword: group for keyword, group in groups}
 
 
 # === 4. 界面展示 ===
 st.sidebar.header("仪表盘")
 uploaded_file = st.sidebar.file_uploader("上传Excel", type=["xlsx"])
 
-df = pd.DataFrame()
+source, mtime = None, None
 if uploaded_file:
-    df = load_data(uploaded_file)
+    source = uploaded_file
 elif os.path.exists(DEFAULT_FILE):
-    df = load_data(DEFAULT_FILE)
+    source = DEFAULT_FILE
+    mtime = os.path.getmtime(DEFAULT_FILE)
 
-if df.empty:
+# 直接用拆好的分块判断有无数据，不必每次运行都把整张表反序列化一遍
+parts = {}
+if source is not None:
+    try:
+        # 上传文件的缓存 key 里带着读取位置，每次传进缓存函数前都倒回开头
+        if uploaded_file:
+            uploaded_file.seek(0)
+        parts = partition_by_keyword(source, mtime)
+    except Exception as e:
+        st.error(f"读取失败: {e}")
+
+if not parts:
     st.warning("⚠️ 暂无有效数据。")
     st.stop()
 
 # 侧边栏筛选
-all_kw = df["keyword"].unique().tolist() if "keyword" in df.columns else []
+all_kw = list(parts)
 selected_jobs = st.sidebar.multiselect(
     "选择岗位", all_kw, default=all_kw if all_kw else None
 )
@@ -104,9 +482,9 @@ if not selected_jobs:
     st.info("请在左侧选择至少一个岗位进行分析")
     st.stop()
 
-# 过滤数据
-plot_df = df[df["keyword"].isin(selected_jobs)].copy()
-plot_df.index = range(1, len(plot_df) + 1)  # 序号从1开始
+# 过滤数据：直接取出选中岗位的分块拼起来，不用每次扫整列
+# 下游只读不写，不用 copy；详细数据表本来就隐藏了索引，也不必重新编号
+plot_df = pd.concat([parts[kw] for kw in selected_jobs])
 
 st.success(f"✅ 分析样本：{len(plot_df)} 条")
 
@@ -121,34 +499,31 @@ with tab1:
 
     # 图表 1: 箱线图 (最专业的分布图)
     st.subheader("1. 薪资分布 (箱线图)")
-    fig_box = px.box(
-        plot_df,
-        x="keyword",
-        y="salary_k",
-        color="keyword",
-        title="各岗位薪资分布区间",
-        labels={"salary_k": "月薪(K)", "keyword": "岗位"},
-    )
+    fig_box = make_box_figure(plot_df[["keyword", "salary_k"]])
     st.plotly_chart(fig_box, use_container_width=True)
 
     # 图表 2: 柱状图 (平均值排行)
     st.subheader("2. 平均薪资排行 (柱状图)")
-    # 算出每个岗位的平均值
-    avg_df = (
-        plot_df.groupby("keyword")["salary_k"]
-        .mean()
-        .reset_index()
-        .sort_values("salary_k")
-    )
-    fig_bar = px.bar(
-        avg_df,
-        x="keyword",
-        y="salary_k",
-        color="keyword",
-        text_auto=".1f",
-        title="各岗位平均薪资对比",
-        labels={"salary_k": "平均月薪(K)", "keyword": "岗位"},
-    )
+    # 算出每个岗位的平均值 (只选了一个岗位时不必走 groupby)
+    if len(selected_jobs) == 1:
+        avg_df = pd.DataFrame(
+            {"keyword": selected_jobs, "salary_k": [plot_df["salary_k"].mean()]}
+        )
+    else:
+        # keyword 是 category，直接按整数编码 bincount 求和 / 计数，不走 groupby
+        categories = plot_df["keyword"].cat.categories
+        codes = plot_df["keyword"].cat.codes.to_numpy()
+        values = plot_df["salary_k"].to_numpy(np.float64)
+        sums = np.bincount(codes, weights=values, minlength=len(categories))
+        cnts = np.bincount(codes, minlength=len(categories))
+        has_rows = cnts > 0  # 没选中的岗位不出现在图里
+        avg_df = pd.DataFrame(
+            {
+                "keyword": categories[has_rows],
+                "salary_k": sums[has_rows] / cnts[has_rows],
+            }
+        ).sort_values("salary_k")
+    fig_bar = make_bar_figure(avg_df)
     st.plotly_chart(fig_bar, use_container_width=True)
 
 # --- Tab 2: 硬/软技能分离热度图 ---
@@ -160,170 +535,34 @@ with tab2:
         st.error("数据缺少 'demand' 列，无法生成热度图")
         st.stop()
 
-    # 2. 定义严格分离的词库
-    # === A. 纯硬核技术栈 (English / Code Only) ===
-    # 剔除了中文词（如'算法'），只留代码相关的英文，保证视觉纯净
-    TECH_STACK_LIST = [
-        "Java",
-        "Python",
-        "C++",
-        "C#",
-        "Go",
-        "Golang",
-        "PHP",
-        "Ruby",
-        "Rust",
-        "Swift",
-        "Kotlin",
-        "JavaScript",
-        "TypeScript",
-        "HTML",
-        "CSS",
-        "Vue",
-        "React",
-        "Angular",
-        "Node",
-        "Node.js",
-        "Spring",
-        "SpringBoot",
-        "SpringCloud",
-        "MyBatis",
-        "Hibernate",
-        "JVM",
-        "Netty",
-        "MySQL",
-        "Redis",
-        "Oracle",
-        "MongoDB",
-        "PostgreSQL",
-        "SQL",
-        "NoSQL",
-        "Linux",
-        "Shell",
-        "Bash",
-        "Docker",
-        "K8s",
-        "Kubernetes",
-        "Nginx",
-        "Git",
-        "Jenkins",
-        "CI/CD",
-        "Kafka",
-        "RabbitMQ",
-        "RocketMQ",
-        "Elasticsearch",
-        "Hadoop",
-        "Spark",
-        "Flink",
-        "Hive",
-        "TensorFlow",
-        "PyTorch",
-        "LLM",
-        "NLP",
-        "CV",
-        "Transformer",
-        "BERT",
-        "GPT",
-    ]
-
-    # === B. 综合素质与软技能 (Chinese Only) ===
-    # 只留中文描述，分析性格与能力
-    SOFT_SKILLS_LIST = [
-        "沟通",
-        "团队",
-        "协作",
-        "责任心",
-        "抗压",
-        "学习能力",
-        "逻辑思维",
-        "自驱力",
-        "热情",
-        "细心",
-        "解决问题",
-        "执行力",
-        "英语",
-        "文档能力",
-        "积极",
-        "主动",
-        "乐观",
-        "创新",
-        "严谨",
-        "诚信",
-        "刻苦",
-        "适应能力",
-        "数据结构",
-        "算法",
-        "多线程",
-        "消息循环",
-        "计算机网络",
-        "操作系统",
-        "数据库",
-        "计算机组成",
-        "本科",
-        "硕士",
-        "博士",
-        "计算机",
-        "软件工程",
-    ]
-
-    # 3. 增加切换开关 (Radio Button)
+    # 2. 增加切换开关 (Radio Button)
     view_mode = st.radio(
         "请选择分析维度：",
         ("💻 编程语言与技术栈", "🤝 综合素质与软技能"),
         horizontal=True,
     )
 
-    # 4. 统计逻辑
-    full_text = " ".join(plot_df["demand"].dropna().astype(str).tolist())
-
-    def count_keywords(text, keyword_list):
-        counts = {}
-        for word in keyword_list:
-            # 转义特殊字符(如C++) + 忽略大小写
-            pattern = re.escape(word)
-            matches = len(re.findall(pattern, text, re.IGNORECASE))
-            if matches > 0:
-                # 统一 Key 的显示格式 (比如把 JAVA 统一显示为 Java)
-                display_name = word
-                if word.upper() in ["HTML", "CSS", "SQL"]:
-                    display_name = word.upper()
-                elif word.capitalize() in ["Java", "Python"]:
-                    display_name = word.capitalize()
-
-                counts[display_name] = matches
-        return counts
-
-    # 5. 根据选择渲染不同图表
+    # 3. 统计逻辑
+    all_counts = count_keywords(plot_df["demand"], ALL_KEYWORDS)
+
+    # 4. 根据选择渲染不同图表
     if "编程语言" in view_mode:
         # --- 渲染硬技能 ---
-        counts = count_keywords(full_text, TECH_STACK_LIST)
+        counts = pick_counts(all_counts, TECH_STACK_LIST)
         color_map = "ocean"  # 科技蓝
         title_text = "硬核技术栈热度"
     else:
         # --- 渲染软技能 ---
-        counts = count_keywords(full_text, SOFT_SKILLS_LIST)
+        counts = pick_counts(all_counts, SOFT_SKILLS_LIST)
         color_map = "magma"  # 活力暖色
         title_text = "职场软实力热度"
 
-    # 6. 画图 (单张大图)
+    # 5. 画图 (单张大图)
     if counts:
         st.markdown(f"### {title_text}")
         try:
-            wc = WordCloud(
-                font_path=FONT_PATH,  # 确保有中文字体
-                width=1000,
-                height=500,  # 画布变大
-                background_color="white",
-                colormap=color_map,
-                max_words=100,
-                prefer_horizontal=0.9,
-            ).generate_from_frequencies(counts)
-
-            # 使用 Matplotlib 显示
-            fig, ax = plt.subplots(figsize=(12, 6))  # 图表尺寸变大
-            ax.imshow(wc, interpolation="bilinear")
-            ax.axis("off")
-            st.pyplot(fig, use_container_width=True)
+            image = render_wordcloud(tuple(counts.items()), color_map, FONT_PATH)
+            st.image(image, use_container_width=True)
 
             # 底部显示 Top 10 数据条
             with st.expander("查看详细排名数据"):
@@ -360,4 +599,3 @@ with tab3:
         use_container_width=True,
         hide_index=True,  # 隐藏最左边的 0,1,2... 索引，看起来更像 Excel
     )
-